@@ -0,0 +1,63 @@
+"""
+Per-frame phase timings for the maze visualizer. Kept free of pygame so
+the profiler can be checked from test_algorithms.py.
+"""
+
+import csv
+import time
+from collections import deque
+
+PROFILE_FRAMES = 300  # Frames kept in the profiling ring buffer
+
+class FrameProfiler:
+    """Per-frame time spent in each visualizer phase, kept in a ring buffer"""
+    PHASES = ("events", "step", "draw", "text", "flip")
+    
+    def __init__(self, enabled=False, size=PROFILE_FRAMES, clock=time.perf_counter):
+        self.enabled = enabled
+        self.clock = clock
+        self.frames = deque(maxlen=size)  # (frame number, seconds per phase...)
+        self.frame_count = 0
+        self.current = None
+        self.last_time = 0.0
+    
+    def start_frame(self):
+        if not self.enabled:
+            return
+        self.current = [0.0] * len(self.PHASES)
+        self.last_time = self.clock()
+    
+    def lap(self, phase):
+        """Charge the time since the previous lap to the given phase"""
+        if self.current is None:
+            return
+        now = self.clock()
+        self.current[self.PHASES.index(phase)] += now - self.last_time
+        self.last_time = now
+    
+    def end_frame(self):
+        if self.current is None:
+            return
+        self.frame_count += 1
+        self.frames.append((self.frame_count, *self.current))
+        self.current = None
+    
+    def averages(self):
+        """Rolling average seconds per phase over the buffered frames"""
+        if not self.frames:
+            return [0.0] * len(self.PHASES)
+        return [sum(frame[i + 1] for frame in self.frames) / len(self.frames)
+                for i in range(len(self.PHASES))]
+    
+    def worst_frame(self):
+        return max((sum(frame[1:]) for frame in self.frames), default=0.0)
+    
+    def write_csv(self, path):
+        """Dump the buffered frames with per-phase times in milliseconds"""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame"] + [f"{phase}_ms" for phase in self.PHASES] + ["total_ms"])
+            for frame in self.frames:
+                times = frame[1:]
+                writer.writerow([frame[0]] + [f"{t * 1000:.3f}" for t in times]
+                                + [f"{sum(times) * 1000:.3f}"])
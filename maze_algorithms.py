@@ -0,0 +1,344 @@
+"""
+Maze algorithms that do not need pygame: the generator registry with
+Kruskal, Prim and Eller generators, and batched solving of many
+(start, goal) pairs. Shared by the Maze classes in maze_generator_solver.py
+and test_algorithms.py.
+"""
+
+import random
+from array import array
+from collections import deque
+
+class PathBatch:
+    """Paths for many queries packed into flat arrays.
+
+    Path i is cells[offsets[i]:offsets[i + 1]], each entry a cell index
+    y * width + x. Unreachable queries get an empty slice.
+    """
+    def __init__(self, width, offsets, cells):
+        self.width = width
+        self.offsets = offsets
+        self.cells = cells
+    
+    def __len__(self):
+        return len(self.offsets) - 1
+    
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("path index out of range")
+        return [(c % self.width, c // self.width)
+                for c in self.cells[self.offsets[i]:self.offsets[i + 1]]]
+
+class MazeAlgorithms:
+    """Mixin for a Maze with width, height, grid (0 for path, 1 for wall) and is_valid"""
+    generators = {}  # name -> generator function, see register_generator
+    
+    def generate(self, algorithm="dfs"):
+        """Generate maze with a registered generator algorithm"""
+        if algorithm not in self.generators:
+            raise ValueError(f"Unknown maze generator: {algorithm}")
+        # Generators carve into the existing grid, so start again from solid walls
+        self.grid = [[1 for _ in range(self.width)] for _ in range(self.height)]
+        self.generators[algorithm](self)
+    
+    @classmethod
+    def register_generator(cls, name, func):
+        """Register func(maze) as a generator usable through generate(name)"""
+        cls.generators[name] = func
+    
+    def generate_maze_kruskal(self):
+        """Generate maze using randomized Kruskal's algorithm"""
+        # Cells sit on odd coordinates; cell (cx, cy) is grid (2cx + 1, 2cy + 1).
+        # Every cell is carved, so start and end need no forced opening; on even
+        # sizes (width - 2, height - 2) is a wall pillar and opening it would add a loop
+        cols, rows = self.width // 2, self.height // 2
+        parent = array('i', range(cols * rows))
+        size = array('i', [1]) * (cols * rows)
+        
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]  # Path halving
+                i = parent[i]
+            return i
+        
+        for cy in range(rows):
+            for cx in range(cols):
+                self.grid[2 * cy + 1][2 * cx + 1] = 0
+        
+        # Walls as (cell, neighbour) index pairs: right and down of every cell
+        walls = []
+        for cy in range(rows):
+            for cx in range(cols):
+                i = cy * cols + cx
+                if cx + 1 < cols:
+                    walls.append((i, i + 1))
+                if cy + 1 < rows:
+                    walls.append((i, i + cols))
+        random.shuffle(walls)
+        
+        for a, b in walls:
+            root_a, root_b = find(a), find(b)
+            if root_a == root_b:
+                continue
+            if size[root_a] < size[root_b]:
+                root_a, root_b = root_b, root_a
+            parent[root_b] = root_a
+            size[root_a] += size[root_b]
+            # Grid wall between the two cells
+            self.grid[(a // cols) + (b // cols) + 1][(a % cols) + (b % cols) + 1] = 0
+    
+    def generate_maze_prim(self):
+        """Generate maze using randomized Prim's algorithm"""
+        cols, rows = self.width // 2, self.height // 2
+        in_maze = bytearray(cols * rows)
+        in_maze[0] = 1
+        self.grid[1][1] = 0
+        frontier = []
+        if cols > 1:
+            frontier.append((0, 1))
+        if rows > 1:
+            frontier.append((0, cols))
+        
+        while frontier:
+            # Pick a random frontier wall and swap-remove it in O(1)
+            k = random.randrange(len(frontier))
+            frontier[k], frontier[-1] = frontier[-1], frontier[k]
+            a, b = frontier.pop()
+            if in_maze[b]:
+                continue
+            in_maze[b] = 1
+            bx, by = b % cols, b // cols
+            self.grid[2 * by + 1][2 * bx + 1] = 0
+            self.grid[(a // cols) + by + 1][(a % cols) + bx + 1] = 0
+            
+            if bx > 0 and not in_maze[b - 1]:
+                frontier.append((b, b - 1))
+            if bx + 1 < cols and not in_maze[b + 1]:
+                frontier.append((b, b + 1))
+            if by > 0 and not in_maze[b - cols]:
+                frontier.append((b, b - cols))
+            if by + 1 < rows and not in_maze[b + cols]:
+                frontier.append((b, b + cols))
+    
+    def generate_maze_eller(self):
+        """Generate maze using Eller's algorithm, one row at a time"""
+        for y, row in enumerate(self.stream_maze_eller(self.width, self.height)):
+            self.grid[y] = row
+    
+    @staticmethod
+    def stream_maze_eller(width, height, rng=random):
+        """Yield the rows of an Eller's algorithm maze, keeping only O(width) state"""
+        cols, rows = width // 2, height // 2
+        yield [1] * width
+        if cols == 0 or rows == 0:
+            for _ in range(height - 1):
+                yield [1] * width
+            return
+        
+        # Set label of every cell in the current row; new cells get label c + cols
+        labels = array('i', range(cols))
+        parent = array('i', range(2 * cols))
+        
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+        
+        for r in range(rows):
+            last = r == rows - 1
+            row = [1] * width
+            for c in range(cols):
+                row[2 * c + 1] = 0
+            
+            # Join neighbouring cells that are in different sets
+            for c in range(cols - 1):
+                a, b = find(labels[c]), find(labels[c + 1])
+                if a != b and (last or rng.random() < 0.5):
+                    parent[b] = a
+                    row[2 * c + 2] = 0
+            yield row
+            if last:
+                break
+            
+            # Every set carries on downwards through at least one cell
+            members = {}
+            for c in range(cols):
+                members.setdefault(find(labels[c]), []).append(c)
+            below = [1] * width
+            next_labels = array('i', [c + cols for c in range(cols)])
+            renumber = {}
+            for root, cells in members.items():
+                down = [c for c in cells if rng.random() < 0.5]
+                if not down:
+                    down = [rng.choice(cells)]
+                label = renumber.setdefault(root, len(renumber))
+                for c in down:
+                    below[2 * c + 1] = 0
+                    next_labels[c] = label
+            yield below
+            
+            labels = next_labels
+            for i in range(2 * cols):
+                parent[i] = i
+        
+        for _ in range(height - 2 * rows):
+            yield [1] * width
+    
+    def solve_many(self, pairs):
+        """Solve many (start, goal) pairs on this maze, sharing the search work"""
+        n = self.width * self.height
+        passable = bytearray(n)
+        for y in range(self.height):
+            row = self.grid[y]
+            for x in range(self.width):
+                if row[x] == 0:
+                    passable[y * self.width + x] = 1
+        
+        # Flatten queries to cell indices, -1 marks an invalid endpoint
+        queries = []
+        for start, goal in pairs:
+            queries.append((self._cell_index(start, passable), self._cell_index(goal, passable)))
+        
+        offsets = array('l', [0])
+        cells = array('i')
+        
+        # One BFS forest over the whole maze; in a perfect maze every path is
+        # the unique tree path, so all queries share this single traversal
+        parent, depth, component, acyclic = self._bfs_forest(passable)
+        
+        if acyclic:
+            for s, g in queries:
+                if s >= 0 and g >= 0 and component[s] == component[g]:
+                    self._append_tree_path(s, g, parent, depth, cells)
+                offsets.append(len(cells))
+            return PathBatch(self.width, offsets, cells)
+        
+        # Mazes with loops: one BFS per distinct endpoint on the smaller side.
+        # Searching from goals gives parent pointers that lead straight to them.
+        starts = {s for s, g in queries if s >= 0 and g >= 0}
+        goals = {g for s, g in queries if s >= 0 and g >= 0}
+        from_goals = len(goals) <= len(starts)
+        
+        groups = {}
+        for i, (s, g) in enumerate(queries):
+            if s >= 0 and g >= 0 and component[s] == component[g]:
+                groups.setdefault(g if from_goals else s, []).append(i)
+        
+        results = [None] * len(queries)
+        for source, indices in groups.items():
+            targets = {queries[i][0] if from_goals else queries[i][1] for i in indices}
+            field = self._bfs_parents(source, passable, targets)
+            for i in indices:
+                s, g = queries[i]
+                path = array('i')
+                current = s if from_goals else g
+                while current != source:
+                    path.append(current)
+                    current = field[current]
+                path.append(source)
+                if not from_goals:
+                    path.reverse()
+                results[i] = path
+        
+        for path in results:
+            if path is not None:
+                cells.extend(path)
+            offsets.append(len(cells))
+        return PathBatch(self.width, offsets, cells)
+    
+    def _cell_index(self, pos, passable):
+        x, y = pos
+        if not self.is_valid(x, y):
+            return -1
+        index = y * self.width + x
+        return index if passable[index] else -1
+    
+    def _bfs_forest(self, passable):
+        """BFS over every open cell, recording parent, depth and component per cell"""
+        width = self.width
+        n = len(passable)
+        parent = array('i', [-1]) * n
+        depth = array('i', [-1]) * n
+        component = array('i', [-1]) * n
+        acyclic = True
+        label = 0
+        
+        for root in range(n):
+            if not passable[root] or depth[root] >= 0:
+                continue
+            depth[root] = 0
+            component[root] = label
+            queue = deque([root])
+            while queue:
+                current = queue.popleft()
+                x = current % width
+                for nxt in (current - width, current + width,
+                            current - 1 if x > 0 else -1,
+                            current + 1 if x < width - 1 else -1):
+                    if nxt < 0 or nxt >= n or not passable[nxt]:
+                        continue
+                    if depth[nxt] >= 0:
+                        # Any edge back into the tree other than to our parent closes a loop
+                        if nxt != parent[current]:
+                            acyclic = False
+                        continue
+                    parent[nxt] = current
+                    depth[nxt] = depth[current] + 1
+                    component[nxt] = label
+                    queue.append(nxt)
+            label += 1
+        
+        return parent, depth, component, acyclic
+    
+    def _bfs_parents(self, source, passable, targets):
+        """BFS from a single cell until every target is reached, returning parents"""
+        width = self.width
+        n = len(passable)
+        parent = array('i', [-1]) * n
+        parent[source] = source
+        remaining = set(targets)
+        remaining.discard(source)
+        queue = deque([source])
+        while queue and remaining:
+            current = queue.popleft()
+            remaining.discard(current)
+            x = current % width
+            for nxt in (current - width, current + width,
+                        current - 1 if x > 0 else -1,
+                        current + 1 if x < width - 1 else -1):
+                if 0 <= nxt < n and passable[nxt] and parent[nxt] < 0:
+                    parent[nxt] = current
+                    queue.append(nxt)
+        return parent
+    
+    def _append_tree_path(self, s, g, parent, depth, cells):
+        """Append the tree path s -> g by climbing both ends to their common ancestor"""
+        head = array('i')
+        tail = array('i')
+        while depth[s] > depth[g]:
+            head.append(s)
+            s = parent[s]
+        while depth[g] > depth[s]:
+            tail.append(g)
+            g = parent[g]
+        while s != g:
+            head.append(s)
+            tail.append(g)
+            s = parent[s]
+            g = parent[g]
+        head.append(s)
+        tail.reverse()
+        cells.extend(head)
+        cells.extend(tail)
+
+def _generate_dfs(maze):
+    # Each Maze class defines its own generate_maze_dfs
+    maze.generate_maze_dfs()
+
+MazeAlgorithms.register_generator("dfs", _generate_dfs)
+MazeAlgorithms.register_generator("kruskal", MazeAlgorithms.generate_maze_kruskal)
+MazeAlgorithms.register_generator("prim", MazeAlgorithms.generate_maze_prim)
+MazeAlgorithms.register_generator("eller", MazeAlgorithms.generate_maze_eller)
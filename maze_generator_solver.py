@@ -3,6 +3,11 @@ import random
 import heapq
 import time
 import math
+import sys
+import cProfile
+
+from frame_profiler import FrameProfiler
+from maze_algorithms import MazeAlgorithms
 
 # Initialize pygame
 pygame.init()
@@ -14,6 +19,10 @@ GRID_WIDTH = WIDTH // CELL_SIZE
 GRID_HEIGHT = HEIGHT // CELL_SIZE
 FPS = 60
 
+# Profiling
+PROFILE_CSV_FILE = "maze_profile.csv"
+PROFILE_STATS_FILE = "maze_profile.pstats"
+
 # Colors
 BACKGROUND = (10, 10, 40)
 WALL_COLOR = (200, 200, 200)
@@ -25,7 +34,7 @@ CURRENT_COLOR = (255, 255, 0)
 SOLUTION_PATH_COLOR = (255, 255, 100)
 TEXT_COLOR = (255, 255, 255)
 
-class Maze:
+class Maze(MazeAlgorithms):
     def __init__(self, width, height):
         self.width = width
         self.height = height
@@ -109,10 +118,12 @@ class Maze:
                 neighbors.append((nx, ny))
         return neighbors
     
-    def solve_astar(self):
+    def solve_astar(self, start=None, end=None):
         """Solve maze using A* algorithm"""
-        start = (1, 1)  # Start at top-left
-        end = (self.width - 2, self.height - 2)  # End at bottom-right
+        if start is None:
+            start = (1, 1)  # Start at top-left
+        if end is None:
+            end = (self.width - 2, self.height - 2)  # End at bottom-right
         
         # Priority queue: (f_score, g_score, x, y)
         open_set = [(self.heuristic(start, end), 0, start[0], start[1])]
@@ -161,7 +172,7 @@ class Maze:
         return []  # No path found
 
 class MazeVisualizer:
-    def __init__(self):
+    def __init__(self, profile=False):
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("Maze Generator & Solver - DFS & A*")
         self.clock = pygame.time.Clock()
@@ -187,6 +198,9 @@ class MazeVisualizer:
         self.astar_path_found = False
         self.astar_current = None
         
+        # Per-frame timing of step, draw, text and flip
+        self.profiler = FrameProfiler(enabled=profile)
+        
     def draw(self):
         self.screen.fill(BACKGROUND)
         
@@ -244,6 +258,7 @@ class MazeVisualizer:
         end_rect = pygame.Rect((GRID_WIDTH - 2) * CELL_SIZE, (GRID_HEIGHT - 2) * CELL_SIZE, CELL_SIZE, CELL_SIZE)
         pygame.draw.rect(self.screen, START_COLOR, start_rect)
         pygame.draw.rect(self.screen, END_COLOR, end_rect)
+        self.profiler.lap("draw")
         
         # Draw UI text
         if self.state == "generating":
@@ -259,14 +274,33 @@ class MazeVisualizer:
         instructions = [
             "Press R to Reset and Regenerate",
             "Press SPACE to Toggle Auto-Solve",
-            "Press S to Solve Manually"
+            "Press S to Solve Manually",
+            "Press P to Toggle Profiling"
         ]
         
         for i, instruction in enumerate(instructions):
             text = self.small_font.render(instruction, True, TEXT_COLOR)
-            self.screen.blit(text, (10, HEIGHT - 60 + i * 20))
+            self.screen.blit(text, (10, HEIGHT - 80 + i * 20))
+        
+        # The overlay is font rendering too, so it is charged to the text phase
+        if self.profiler.enabled:
+            self.draw_profile_overlay()
+        self.profiler.lap("text")
         
         pygame.display.flip()
+        self.profiler.lap("flip")
+    
+    def draw_profile_overlay(self):
+        """Draw rolling average phase times and the worst frame in the top-right corner"""
+        lines = [f"{phase}: {avg * 1000:.2f} ms"
+                 for phase, avg in zip(FrameProfiler.PHASES, self.profiler.averages())]
+        lines.append(f"worst: {self.profiler.worst_frame() * 1000:.2f} ms")
+        
+        panel = pygame.Rect(WIDTH - 150, 5, 145, 10 + len(lines) * 18)
+        pygame.draw.rect(self.screen, BACKGROUND, panel)
+        for i, line in enumerate(lines):
+            text = self.small_font.render(line, True, TEXT_COLOR)
+            self.screen.blit(text, (WIDTH - 145, 10 + i * 18))
     
     def generate_step(self):
         """Perform one step of maze generation"""
@@ -389,6 +423,9 @@ class MazeVisualizer:
         auto_solve = False
         
         while running:
+            self.profiler.start_frame()
+            
+            # Key handlers such as R and S run whole resets or solves inside this phase
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
@@ -399,6 +436,9 @@ class MazeVisualizer:
                         auto_solve = not auto_solve
                     elif event.key == pygame.K_s:
                         self.solve_all()
+                    elif event.key == pygame.K_p:
+                        self.profiler.enabled = not self.profiler.enabled
+            self.profiler.lap("events")
             
             # Update based on current state
             if self.state == "generating":
@@ -407,12 +447,23 @@ class MazeVisualizer:
                 self.solve_step()
             elif auto_solve and self.state == "solved":
                 self.reset()
+            self.profiler.lap("step")
             
             self.draw()
+            self.profiler.end_frame()
             self.clock.tick(FPS)
         
+        if self.profiler.frames:
+            self.profiler.write_csv(PROFILE_CSV_FILE)
+            print(f"Frame timings written to {PROFILE_CSV_FILE}")
+        
         pygame.quit()
 
 if __name__ == "__main__":
-    visualizer = MazeVisualizer()
-    visualizer.run()
\ No newline at end of file
+    visualizer = MazeVisualizer(profile="--profile" in sys.argv)
+    if "--cprofile" in sys.argv:
+        # Function-level breakdown, view with: python -m pstats maze_profile.pstats
+        cProfile.run("visualizer.run()", PROFILE_STATS_FILE)
+        print(f"cProfile stats written to {PROFILE_STATS_FILE}")
+    else:
+        visualizer.run()
\ No newline at end of file
@@ -3,11 +3,20 @@ Test script to verify the DFS maze generation and A* solving algorithms
 without requiring pygame for visualization.
 """
 
+import csv
+import os
 import random
 import heapq
+import tempfile
 import time
+import tracemalloc
+from collections import deque
 
-class Maze:
+from frame_profiler import FrameProfiler
+from maze_algorithms import MazeAlgorithms
+from tiled_maze import TiledMaze
+
+class Maze(MazeAlgorithms):
     def __init__(self, width, height):
         self.width = width
         self.height = height
@@ -90,10 +99,12 @@ class Maze:
                 neighbors.append((nx, ny))
         return neighbors
     
-    def solve_astar(self):
+    def solve_astar(self, start=None, end=None):
         """Solve maze using A* algorithm"""
-        start = (1, 1)  # Start at top-left
-        end = (self.width - 2, self.height - 2)  # End at bottom-right
+        if start is None:
+            start = (1, 1)  # Start at top-left
+        if end is None:
+            end = (self.width - 2, self.height - 2)  # End at bottom-right
         
         # Priority queue: (f_score, g_score, x, y)
         open_set = [(self.heuristic(start, end), 0, start[0], start[1])]
@@ -156,6 +167,222 @@ def print_maze(maze, solution_path=None):
                 row += " "
         print(row)
 
+def bfs_distances(maze, source):
+    """Shortest step count from source to every reachable path cell"""
+    dist = {source: 0}
+    queue = deque([source])
+    while queue:
+        x, y = queue.popleft()
+        for neighbor in maze.get_neighbors_astar(x, y):
+            if neighbor not in dist:
+                dist[neighbor] = dist[(x, y)] + 1
+                queue.append(neighbor)
+    return dist
+
+def random_pairs(maze, num_pairs):
+    """Random (start, goal) pairs among the cells reachable from (1, 1)"""
+    cells = list(bfs_distances(maze, (1, 1)))
+    return [(random.choice(cells), random.choice(cells)) for _ in range(num_pairs)]
+
+def benchmark_solve_many(width=61, height=61, num_pairs=200):
+    """Compare batched solving against one A* call per pair"""
+    print(f"\nBenchmarking {num_pairs} queries on a {width}x{height} maze...")
+    maze = Maze(width, height)
+    maze.generate_maze_dfs()
+    pairs = random_pairs(maze, num_pairs)
+    
+    start_time = time.time()
+    loop_paths = [maze.solve_astar(start, goal) for start, goal in pairs]
+    loop_time = time.time() - start_time
+    
+    start_time = time.time()
+    batch = maze.solve_many(pairs)
+    batch_time = time.time() - start_time
+    
+    for i, (start, goal) in enumerate(pairs):
+        path = batch[i]
+        assert path[0] == start and path[-1] == goal
+        assert len(path) == len(loop_paths[i]), "batched path is not shortest"
+    
+    print(f"Per-pair A* loop: {loop_time:.4f} seconds")
+    print(f"solve_many:       {batch_time:.4f} seconds ({loop_time / max(batch_time, 1e-9):.1f}x)")
+    
+    # Knock out some walls so the maze has loops and the per-goal BFS path is used
+    for _ in range(width * height // 20):
+        x = random.randrange(1, width - 1)
+        y = random.randrange(1, height - 1)
+        maze.grid[y][x] = 0
+    pairs = random_pairs(maze, num_pairs)
+    
+    start_time = time.time()
+    for start, goal in pairs:
+        maze.solve_astar(start, goal)
+    loop_time = time.time() - start_time
+    
+    start_time = time.time()
+    batch = maze.solve_many(pairs)
+    batch_time = time.time() - start_time
+    
+    distances = {}
+    for i, (start, goal) in enumerate(pairs):
+        path = batch[i]
+        assert path[0] == start and path[-1] == goal
+        for (x1, y1), (x2, y2) in zip(path, path[1:]):
+            assert abs(x1 - x2) + abs(y1 - y2) == 1 and maze.grid[y2][x2] == 0
+        if goal not in distances:
+            distances[goal] = bfs_distances(maze, goal)
+        assert len(path) == distances[goal][start] + 1, "batched path is not shortest"
+    print(f"Per-pair A* loop with loops: {loop_time:.4f} seconds")
+    print(f"solve_many with loops:       {batch_time:.4f} seconds "
+          f"({loop_time / max(batch_time, 1e-9):.1f}x)")
+
+def tiled_memory_bound(tiled, max_resident):
+    """Bytes a tiled generate or solve may allocate beyond the maze object itself"""
+    T = tiled.tile_size
+    num_tiles = tiled.tiles_x * tiled.tiles_y
+    resident = max_resident * T * T  # One byte per cell of every resident tile
+    # BFS arrays and a refined segment of (x, y) tuples inside one tile
+    tile_work = 48 * T * T
+    # Openings and portal distances (28 bytes) plus A* state for 4 portals (29 bytes each)
+    per_tile = num_tiles * (28 + 4 * 29)
+    return resident + tile_work + per_tile + 64 * 1024
+
+def benchmark_tiled_maze(tiles=16, tile_size=64, max_resident=8):
+    """Check hierarchical solving on a tiled maze and report time and peak memory"""
+    print("\nChecking tiled maze solving against a full in-memory BFS...")
+    with TiledMaze(3, 2, tile_size=8, max_resident=1, seed=7) as tiled:
+        tiled.generate()
+        maze = Maze(tiled.width, tiled.height)
+        maze.grid = [[tiled.cell(x, y) for x in range(tiled.width)] for y in range(tiled.height)]
+        # Any open cell, including the openings on tile borders
+        open_cells = [(x, y) for y in range(maze.height) for x in range(maze.width)
+                      if maze.grid[y][x] == 0]
+        pairs = [(random.choice(open_cells), random.choice(open_cells)) for _ in range(200)]
+        batch = maze.solve_many(pairs)
+        for i, (start, goal) in enumerate(pairs):
+            path = tiled.solve(start, goal)
+            assert path[0] == start and path[-1] == goal
+            assert len(set(path)) == len(path), "tiled path repeats a cell"
+            assert len(path) == len(batch[i]), "tiled path is not shortest"
+    
+    print(f"Generating a {tiles}x{tiles} tile maze ({tiles * tile_size} cells square, "
+          f"{max_resident} resident tiles)...")
+    # Tracing slows generation down a lot, so its memory is checked on a smaller maze
+    tracemalloc.start()
+    with TiledMaze(8, 8, tile_size=32, max_resident=2) as tiled:
+        bound = tiled_memory_bound(tiled, 2)
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        tiled.generate()
+        gen_peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    assert gen_peak <= bound, f"generation used {gen_peak} bytes, bound is {bound}"
+    
+    with TiledMaze(tiles, tiles, tile_size=tile_size, max_resident=max_resident) as tiled:
+        start_time = time.time()
+        tiled.generate()
+        gen_time = time.time() - start_time
+        
+        # Stream the route so the check covers solving, not holding the answer
+        bound = tiled_memory_bound(tiled, max_resident)
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        start_time = time.time()
+        path_length = sum(1 for _ in tiled.iter_solve())
+        solve_time = time.time() - start_time
+        solve_peak = tracemalloc.get_traced_memory()[1] - baseline
+        tracemalloc.stop()
+    
+    assert solve_peak <= bound, f"solving used {solve_peak} bytes, bound is {bound}"
+    print(f"Tiled generation: {gen_time:.4f} seconds")
+    print(f"Tiled solving:    {solve_time:.4f} seconds, path length {path_length}")
+    print(f"Peak memory:      {solve_peak / 1024:.0f} KB solving, bound {bound / 1024:.0f} KB")
+
+def is_perfect_maze(maze):
+    """True if the open cells form one tree that reaches every odd cell from (1, 1)"""
+    passable = bytearray(1 - v for row in maze.grid for v in row)
+    _, _, _, acyclic = maze._bfs_forest(passable)
+    reachable = bfs_distances(maze, (1, 1))
+    odd_cells = [(x, y) for y in range(1, maze.height, 2) for x in range(1, maze.width, 2)]
+    return (acyclic and len(reachable) == sum(passable)
+            and all(cell in reachable for cell in odd_cells))
+
+def benchmark_generators(width=201, height=201):
+    """Report cells per second for every registered generator"""
+    print(f"\nBenchmarking generators on a {width}x{height} maze...")
+    cells = (width // 2) * (height // 2)
+    for name in Maze.generators:
+        maze = Maze(width, height)
+        start_time = time.time()
+        maze.generate(name)
+        gen_time = time.time() - start_time
+        
+        if name != "dfs":
+            assert is_perfect_maze(maze), f"{name} did not produce a perfect maze"
+            # Even sizes carve cells into the last row and column, leaving
+            # (width - 2, height - 2) as a wall pillar
+            for size in [(40, 30), (41, 30), (40, 31), (5, 4)]:
+                small = Maze(*size)
+                small.generate(name)
+                assert is_perfect_maze(small), f"{name} is not perfect at {size}"
+            # Regenerating must replace the old maze, not add a second tree to it
+            maze.generate(name)
+            assert is_perfect_maze(maze), f"{name} is not perfect after regenerating"
+        print(f"{name:>12}: {cells / gen_time:,.0f} cells/second")
+    
+    # Streaming only keeps one row of state, so the maze never has to exist in full
+    rows = 0
+    start_time = time.time()
+    for row in Maze.stream_maze_eller(width, height * 10):
+        assert len(row) == width
+        rows += 1
+    stream_time = time.time() - start_time
+    assert rows == height * 10
+    print(f"{'eller stream':>12}: {cells * 10 / stream_time:,.0f} cells/second")
+
+def check_frame_profiler():
+    """Feed synthetic laps through FrameProfiler and check its buffer, stats and CSV"""
+    print("\nChecking the visualizer frame profiler...")
+    now = [0.0]
+    
+    def advance(seconds):
+        now[0] += seconds
+    
+    # Disabled: every call is a no-op
+    profiler = FrameProfiler(enabled=False, size=3, clock=lambda: now[0])
+    profiler.start_frame()
+    advance(1.0)
+    profiler.lap("step")
+    profiler.end_frame()
+    assert not profiler.frames and profiler.frame_count == 0
+    assert profiler.averages() == [0.0] * len(FrameProfiler.PHASES)
+    assert profiler.worst_frame() == 0.0
+    
+    # Frame k spends k ms in every phase; only the last three stay in the buffer
+    profiler.enabled = True
+    for k in range(1, 6):
+        profiler.start_frame()
+        for phase in FrameProfiler.PHASES:
+            advance(k / 1000)
+            profiler.lap(phase)
+        profiler.end_frame()
+    assert [frame[0] for frame in profiler.frames] == [3, 4, 5]
+    for average in profiler.averages():
+        assert abs(average - 0.004) < 1e-9
+    assert abs(profiler.worst_frame() - 5 * len(FrameProfiler.PHASES) / 1000) < 1e-9
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "profile.csv")
+        profiler.write_csv(path)
+        with open(path, newline="") as f:
+            rows = list(csv.reader(f))
+    assert rows[0] == ["frame"] + [f"{phase}_ms" for phase in FrameProfiler.PHASES] + ["total_ms"]
+    assert [row[0] for row in rows[1:]] == ["3", "4", "5"]
+    for k, row in zip((3, 4, 5), rows[1:]):
+        assert all(abs(float(value) - k) < 1e-6 for value in row[1:-1])
+        assert abs(float(row[-1]) - k * len(FrameProfiler.PHASES)) < 1e-6
+    print("Frame profiler ring buffer, averages and CSV output are correct")
+
 def main():
     print("Testing DFS Maze Generation and A* Solving Algorithms")
     print("=" * 50)
@@ -190,6 +417,11 @@ def main():
     else:
         print("\nNo solution found!")
     
+    benchmark_generators()
+    benchmark_solve_many()
+    benchmark_tiled_maze()
+    check_frame_profiler()
+    
     print("\nTest completed successfully!")
 
 if __name__ == "__main__":
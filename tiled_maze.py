@@ -0,0 +1,482 @@
+"""
+Tiled, out-of-core maze generation and hierarchical (HPA*-style) solving
+for mazes too large to hold in memory as Python lists.
+
+The maze is cut into square tiles that are generated one at a time and
+spilled to a memory-mapped file. Each tile is a perfect maze of its own,
+joined to its east and south neighbours through one opening in the shared
+wall. Solving searches an abstract graph of those openings (portals) and
+only loads the tiles that the final route passes through.
+"""
+
+import mmap
+import os
+import random
+import tempfile
+from array import array
+from collections import OrderedDict, deque
+
+# Portal slots of a tile: one opening on each side
+WEST, NORTH, EAST, SOUTH = 0, 1, 2, 3
+
+# Index into the six intra-tile distances stored per tile for each slot pair
+SLOT_PAIRS = [(WEST, NORTH), (WEST, EAST), (WEST, SOUTH),
+              (NORTH, EAST), (NORTH, SOUTH), (EAST, SOUTH)]
+PAIR_INDEX = {pair: i for i, (a, b) in enumerate(SLOT_PAIRS) for pair in ((a, b), (b, a))}
+
+
+class TileStore:
+    """Tiles kept in a memory-mapped file with at most max_resident tiles in RAM"""
+    def __init__(self, num_tiles, tile_size, max_resident, path=None):
+        self.tile_bytes = tile_size * tile_size
+        self.max_resident = max(1, max_resident)
+        self.resident = OrderedDict()  # tile index -> bytearray, least recently used first
+        self.dirty = set()
+
+        if path is None:
+            fd, path = tempfile.mkstemp(suffix=".maze")
+            self.owns_file = True
+        else:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT)
+            self.owns_file = False
+        self.path = path
+        size = num_tiles * self.tile_bytes
+        os.ftruncate(fd, size)  # Sparse on most filesystems
+        self.mm = mmap.mmap(fd, size)
+        os.close(fd)
+
+        # Dropping mapped pages after each copy keeps them out of our RSS
+        self.can_release = (hasattr(self.mm, "madvise")
+                            and self.tile_bytes % mmap.PAGESIZE == 0)
+
+    def get(self, index):
+        """Return a tile, loading it from the file if it is not resident"""
+        tile = self.resident.get(index)
+        if tile is not None:
+            self.resident.move_to_end(index)
+            return tile
+        offset = index * self.tile_bytes
+        tile = bytearray(self.mm[offset:offset + self.tile_bytes])
+        self._release(offset)
+        self._make_room()
+        self.resident[index] = tile
+        return tile
+
+    def put(self, index, tile):
+        """Make a freshly built tile resident and schedule it for write-back"""
+        if index not in self.resident:
+            self._make_room()
+        self.resident[index] = tile
+        self.resident.move_to_end(index)
+        self.dirty.add(index)
+
+    def _make_room(self):
+        while len(self.resident) >= self.max_resident:
+            index, tile = self.resident.popitem(last=False)
+            self._write_back(index, tile)
+
+    def _write_back(self, index, tile):
+        if index in self.dirty:
+            offset = index * self.tile_bytes
+            self.mm[offset:offset + self.tile_bytes] = tile
+            self._release(offset)
+            self.dirty.discard(index)
+
+    def _release(self, offset):
+        if self.can_release:
+            self.mm.madvise(mmap.MADV_DONTNEED, offset, self.tile_bytes)
+
+    def flush(self):
+        for index, tile in self.resident.items():
+            self._write_back(index, tile)
+        self.mm.flush()
+
+    def close(self):
+        if self.mm.closed:
+            return
+        self.flush()
+        self.resident.clear()
+        self.mm.close()
+        if self.owns_file:
+            os.remove(self.path)
+
+
+class TiledMaze:
+    def __init__(self, tiles_x, tiles_y, tile_size=64, max_resident=16, path=None, seed=None):
+        if tile_size < 4 or tile_size % 2:
+            raise ValueError("tile_size must be an even number of at least 4")
+        if tile_size > 0xFFFF:
+            raise ValueError("tile_size must fit in 16 bits")
+        self.tiles_x = tiles_x
+        self.tiles_y = tiles_y
+        self.tile_size = tile_size
+        # Cells sit on odd coordinates, walls on even ones, as in Maze
+        self.width = tiles_x * tile_size
+        self.height = tiles_y * tile_size
+        self.seed = random.randrange(1 << 30) if seed is None else seed
+
+        num_tiles = tiles_x * tiles_y
+        self.store = TileStore(num_tiles, tile_size, max_resident, path)
+
+        # Offset of the opening in each tile's west and north walls
+        self.west_opening = array('H', [0]) * num_tiles
+        self.north_opening = array('H', [0]) * num_tiles
+        # Shortest in-tile distance between each pair of portal slots, -1 if absent
+        self.portal_dist = array('i', [-1]) * (num_tiles * len(SLOT_PAIRS))
+        self.generated = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.store.close()
+
+    def tile_index(self, x, y):
+        return (y // self.tile_size) * self.tiles_x + x // self.tile_size
+
+    def is_valid(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def cell(self, x, y):
+        """Return 0 for path, 1 for wall, loading the tile if needed"""
+        if not self.is_valid(x, y):
+            return 1
+        T = self.tile_size
+        tile = self.store.get(self.tile_index(x, y))
+        return tile[(y % T) * T + x % T]
+
+    def _rng(self, tx, ty, salt):
+        # Each tile (and each of its walls) gets its own reproducible stream
+        return random.Random(((self.seed * 1000003 + ty) * 1000003 + tx) * 4 + salt)
+
+    def generate(self):
+        """Generate every tile once, spilling each to disk as the window moves on"""
+        T = self.tile_size
+        for ty in range(self.tiles_y):
+            for tx in range(self.tiles_x):
+                t = ty * self.tiles_x + tx
+                # Openings are decided up front so neighbours agree on them
+                if tx > 0:
+                    self.west_opening[t] = self._rng(tx, ty, 1).randrange(1, T, 2)
+                if ty > 0:
+                    self.north_opening[t] = self._rng(tx, ty, 2).randrange(1, T, 2)
+
+        for ty in range(self.tiles_y):
+            for tx in range(self.tiles_x):
+                t = ty * self.tiles_x + tx
+                tile = self._generate_tile(tx, ty)
+                self.store.put(t, tile)
+                self._link_tile(t, tile)
+        self.store.flush()
+        self.generated = True
+
+    def _generate_tile(self, tx, ty):
+        """DFS maze inside one tile, plus its west and north openings"""
+        T = self.tile_size
+        rng = self._rng(tx, ty, 0)
+        tile = bytearray(b"\x01") * (T * T)
+        tile[T + 1] = 0
+        stack = [(1, 1)]
+
+        while stack:
+            x, y = stack[-1]
+            unvisited = []
+            for dx, dy in ((0, 2), (2, 0), (0, -2), (-2, 0)):
+                nx, ny = x + dx, y + dy
+                if 0 < nx < T and 0 < ny < T and tile[ny * T + nx] == 1:
+                    unvisited.append((nx, ny))
+            if unvisited:
+                nx, ny = rng.choice(unvisited)
+                tile[((y + ny) // 2) * T + (x + nx) // 2] = 0  # Wall between
+                tile[ny * T + nx] = 0
+                stack.append((nx, ny))
+            else:
+                stack.pop()
+
+        t = ty * self.tiles_x + tx
+        if tx > 0:
+            tile[self.west_opening[t] * T] = 0
+        if ty > 0:
+            tile[self.north_opening[t]] = 0
+        return tile
+
+    def _slot_local(self, t, slot):
+        """Local (x, y) of a portal slot inside tile t, or None on the maze border"""
+        T = self.tile_size
+        tx, ty = t % self.tiles_x, t // self.tiles_x
+        if slot == WEST:
+            return (1, self.west_opening[t]) if tx > 0 else None
+        if slot == NORTH:
+            return (self.north_opening[t], 1) if ty > 0 else None
+        if slot == EAST:
+            return (T - 1, self.west_opening[t + 1]) if tx < self.tiles_x - 1 else None
+        return (self.north_opening[t + self.tiles_x], T - 1) if ty < self.tiles_y - 1 else None
+
+    def _slot_cell(self, t, slot):
+        local = self._slot_local(t, slot)
+        if local is None:
+            return None
+        T = self.tile_size
+        return ((t % self.tiles_x) * T + local[0], (t // self.tiles_x) * T + local[1])
+
+    def _link_tile(self, t, tile):
+        """Record the in-tile distances between this tile's portal slots"""
+        T = self.tile_size
+        base = t * len(SLOT_PAIRS)
+        for a in (WEST, NORTH, EAST):
+            local = self._slot_local(t, a)
+            if local is None:
+                continue
+            _, dist = tile_bfs(tile, T, local[1] * T + local[0])
+            for b in range(a + 1, SOUTH + 1):
+                other = self._slot_local(t, b)
+                if other is not None:
+                    self.portal_dist[base + PAIR_INDEX[(a, b)]] = dist[other[1] * T + other[0]]
+
+    def _across(self, t, slot):
+        """The tile and portal slot on the other side of an opening"""
+        if slot == WEST:
+            return t - 1, EAST
+        if slot == EAST:
+            return t + 1, WEST
+        if slot == NORTH:
+            return t - self.tiles_x, SOUTH
+        return t + self.tiles_x, NORTH
+
+    def solve(self, start=None, end=None):
+        """Solve with HPA* and return the path as a list of (x, y) cells"""
+        return list(self.iter_solve(start, end))
+
+    def iter_solve(self, start=None, end=None):
+        """Solve with HPA*: search the portal graph, then yield the route cell by cell"""
+        if not self.generated:
+            raise RuntimeError("generate() must be called before solve()")
+        if start is None:
+            start = (1, 1)
+        if end is None:
+            end = (self.width - 1, self.height - 1)
+        if self.cell(*start) != 0 or self.cell(*end) != 0:
+            return
+
+        T = self.tile_size
+        start_tile = self.tile_index(*start)
+        end_tile = self.tile_index(*end)
+
+        # Connect start and end to the portals of their own tiles
+        start_edges = self._endpoint_edges(start_tile, start)
+        end_edges = dict(self._endpoint_edges(end_tile, end))
+
+        # Abstract A* over nodes tile * 4 + slot, plus START and END. All search
+        # state lives in flat arrays so it costs a fixed few bytes per tile
+        num_nodes = len(self.west_opening) * 4 + 2
+        START, END = num_nodes - 2, num_nodes - 1
+
+        def coords(node):
+            if node == START:
+                return start
+            if node == END:
+                return end
+            return self._slot_cell(node // 4, node % 4)
+
+        def heuristic(node):
+            x, y = coords(node)
+            return abs(x - end[0]) + abs(y - end[1])
+
+        g_score = array('q', [-1]) * num_nodes
+        came_from = array('i', [-1]) * num_nodes
+        closed_set = bytearray(num_nodes)
+        open_set = NodeHeap(num_nodes)
+        g_score[START] = 0
+        open_set.push(START, heuristic(START))
+
+        if start_tile == end_tile:
+            tile = self.store.get(start_tile)
+            _, dist = tile_bfs(tile, T, self._local_index(start))
+            d = dist[self._local_index(end)]
+            if d >= 0:
+                g_score[END] = d
+                came_from[END] = START
+                open_set.push(END, d)
+
+        while open_set:
+            node = open_set.pop()
+            if node == END:
+                break
+            closed_set[node] = 1
+            g = g_score[node]
+
+            if node == START:
+                edges = start_edges
+            else:
+                edges = self._portal_edges(node)
+                if node in end_edges:
+                    edges.append((END, end_edges[node]))
+
+            for nxt, cost in edges:
+                tentative = g + cost
+                if not closed_set[nxt] and (g_score[nxt] < 0 or tentative < g_score[nxt]):
+                    g_score[nxt] = tentative
+                    came_from[nxt] = node
+                    open_set.push(nxt, tentative + heuristic(nxt))
+
+        if came_from[END] < 0:
+            return
+
+        route = array('i', [END])
+        while route[-1] != START:
+            route.append(came_from[route[-1]])
+        route.reverse()
+        # Only the portal route is kept; the cells are produced one tile at a time
+        del g_score, came_from, closed_set, open_set
+        yield from self._refine(coords(node) for node in route)
+
+    def _local_index(self, pos):
+        T = self.tile_size
+        return (pos[1] % T) * T + pos[0] % T
+
+    def _endpoint_edges(self, t, pos):
+        """Distances from a cell to the portal slots it can reach without crossing a tile"""
+        T = self.tile_size
+        tile = self.store.get(t)
+        _, dist = tile_bfs(tile, T, self._local_index(pos))
+        edges = []
+        for slot in (WEST, NORTH, EAST, SOUTH):
+            local = self._slot_local(t, slot)
+            if local is not None:
+                d = dist[local[1] * T + local[0]]
+                if d >= 0:
+                    edges.append((t * 4 + slot, d))
+
+        # An opening cell is also one step from the slot just across it
+        x, y = pos[0] % T, pos[1] % T
+        if x == 0 and self._slot_local(t, WEST) is not None:
+            edges.append(((t - 1) * 4 + EAST, 1))
+        elif y == 0 and self._slot_local(t, NORTH) is not None:
+            edges.append(((t - self.tiles_x) * 4 + SOUTH, 1))
+        return edges
+
+    def _portal_edges(self, node):
+        t, slot = node // 4, node % 4
+        base = t * len(SLOT_PAIRS)
+        other_tile, other_slot = self._across(t, slot)
+        edges = [(other_tile * 4 + other_slot, 2)]  # Step through the opening
+        for other in (WEST, NORTH, EAST, SOUTH):
+            if other != slot:
+                d = self.portal_dist[base + PAIR_INDEX[(slot, other)]]
+                if d >= 0:
+                    edges.append((t * 4 + other, d))
+        return edges
+
+    def _refine(self, waypoints):
+        """Yield the cells between consecutive waypoints, loading only the tiles on the route"""
+        T = self.tile_size
+        waypoints = iter(waypoints)
+        a = next(waypoints)
+        yield a
+        for b in waypoints:
+            ta, tb = self.tile_index(*a), self.tile_index(*b)
+            if ta != tb:
+                # Crossing a portal: one step onto the opening, one step off it,
+                # or a single step when one side is the opening cell itself
+                if abs(a[0] - b[0]) + abs(a[1] - b[1]) == 2:
+                    yield ((a[0] + b[0]) // 2, (a[1] + b[1]) // 2)
+                yield b
+            elif a != b:
+                tile = self.store.get(ta)
+                parent, _ = tile_bfs(tile, T, self._local_index(a))
+                x0, y0 = (ta % self.tiles_x) * T, (ta // self.tiles_x) * T
+                segment = []
+                current = self._local_index(b)
+                source = self._local_index(a)
+                while current != source:
+                    segment.append((x0 + current % T, y0 + current // T))
+                    current = parent[current]
+                yield from reversed(segment)
+            a = b
+
+
+class NodeHeap:
+    """Binary min-heap of node ids with decrease-key, kept in flat arrays"""
+    def __init__(self, size):
+        self.heap = array('i', [0]) * size
+        self.position = array('i', [-1]) * size  # -1 never pushed, -2 popped
+        self.key = array('q', [0]) * size
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def push(self, node, key):
+        """Insert node, or lower its key if it is already queued"""
+        i = self.position[node]
+        if i >= 0:
+            if key >= self.key[node]:
+                return
+        else:
+            i = self.count
+            self.count += 1
+        self.key[node] = key
+        self._sift_up(i, node)
+
+    def pop(self):
+        heap = self.heap
+        node = heap[0]
+        self.position[node] = -2
+        self.count -= 1
+        if self.count:
+            self._sift_down(0, heap[self.count])
+        return node
+
+    def _sift_up(self, i, node):
+        heap, position, key = self.heap, self.position, self.key
+        k = key[node]
+        while i > 0:
+            parent = (i - 1) // 2
+            other = heap[parent]
+            if key[other] <= k:
+                break
+            heap[i] = other
+            position[other] = i
+            i = parent
+        heap[i] = node
+        position[node] = i
+
+    def _sift_down(self, i, node):
+        heap, position, key = self.heap, self.position, self.key
+        k = key[node]
+        while True:
+            child = 2 * i + 1
+            if child >= self.count:
+                break
+            if child + 1 < self.count and key[heap[child + 1]] < key[heap[child]]:
+                child += 1
+            if key[heap[child]] >= k:
+                break
+            heap[i] = heap[child]
+            position[heap[i]] = i
+            i = child
+        heap[i] = node
+        position[node] = i
+
+
+def tile_bfs(tile, size, source):
+    """BFS inside one tile, returning parent and distance arrays indexed y * size + x"""
+    n = size * size
+    parent = array('i', [-1]) * n
+    dist = array('i', [-1]) * n
+    dist[source] = 0
+    queue = deque([source])
+    while queue:
+        current = queue.popleft()
+        x = current % size
+        for nxt in (current - size, current + size,
+                    current - 1 if x > 0 else -1,
+                    current + 1 if x < size - 1 else -1):
+            if 0 <= nxt < n and tile[nxt] == 0 and dist[nxt] < 0:
+                dist[nxt] = dist[current] + 1
+                parent[nxt] = current
+                queue.append(nxt)
+    return parent, dist